@@ -1,59 +1,48 @@
 """
-OAuth 2.1 Protected Resource Metadata Handler
+OAuth 2.1 Protected Resource Metadata
 
-This module implements the OAuth 2.1 protected resource metadata endpoint
+This module loads the OAuth 2.1 protected resource metadata served at
 (/.well-known/oauth-protected-resource) that provides OAuth client discovery
 information for ScaleKit authentication.
 """
 
 import json
-from fastapi import Response
 from config import config
 from logger import logger
 
-async def oauth_protected_resource_handler() -> Response:
+def load_protected_resource_metadata() -> tuple[int, dict]:
     """
-    Handle OAuth 2.1 protected resource metadata endpoint.
-    
-    This endpoint provides OAuth client discovery information including:
+    Load OAuth 2.1 protected resource metadata from configuration.
+
+    The metadata provides OAuth client discovery information including:
     - Authorization server URLs
     - Supported bearer token methods
     - Resource identifier
     - Supported scopes
-    
-    Returns either custom metadata from environment variables or default
-    metadata structure following ScaleKit OAuth 2.1 specification.
+
+    Called once at startup; returns the HTTP status and JSON body to serve,
+    either the metadata from environment variables or an error payload.
     """
     try:
-        logger.info("OAuth protected resource metadata requested")
-        
         # Use custom metadata if provided in environment variables
         if config.PROTECTED_RESOURCE_METADATA:
             logger.info("Using custom OAuth metadata from environment")
             metadata = json.loads(config.PROTECTED_RESOURCE_METADATA)
         else:
-            # If PROTECTED_RESOURCE_METADATA is not set, return an error
+            # If PROTECTED_RESOURCE_METADATA is not set, serve an error
             logger.error("PROTECTED_RESOURCE_METADATA config missing for OAuth metadata endpoint")
-            return Response(
-                content=json.dumps({"error": "PROTECTED_RESOURCE_METADATA config missing"}),
-                media_type="application/json",
-                status_code=500
-            )
+            return 500, {"error": "PROTECTED_RESOURCE_METADATA config missing"}
 
         logger.info(f"OAuth metadata response: {json.dumps(metadata, indent=2)}")
         logger.info(f"Authorization server: {metadata['authorization_servers'][0]}")
         logger.info(f"Supported scopes: {metadata['scopes_supported']}")
-        
-        return Response(
-            content=json.dumps(metadata, indent=2),
-            media_type="application/json",
-            status_code=200
-        )
-        
+
+        return 200, metadata
+
     except json.JSONDecodeError as e:
         logger.error(f"Invalid OAuth metadata JSON: {e}")
-        return Response(
-            content=json.dumps({"error": "Invalid metadata configuration"}),
-            media_type="application/json",
-            status_code=500
-        )
\ No newline at end of file
+        return 500, {"error": "Invalid metadata configuration"}
+    except (KeyError, IndexError, TypeError) as e:
+        # Runs at import, so a malformed document must not stop the server starting
+        logger.error(f"OAuth metadata missing required fields: {e!r}")
+        return 500, {"error": "Invalid metadata configuration"}
@@ -21,6 +21,9 @@ class Config:
     # Server settings
     PORT = int(os.getenv("PORT", 3015))  # Default port for MCP server
     LOG_LEVEL = os.getenv("LOG_LEVEL", "info")  # Logging level (debug, info, warning, error)
+    ENV = os.getenv("ENV", "production")  # Deployment environment (dev, production)
+    RELOAD = ENV == "dev"  # Auto-reload on code changes (development only)
+    WORKERS = int(os.getenv("WORKERS", 1))  # Uvicorn worker processes (ignored when reloading)
     
     # ScaleKit OAuth 2.1 configuration
     SK_ENV_URL = os.getenv("SK_ENV_URL", "")  # ScaleKit environment URL
@@ -35,5 +38,9 @@ class Config:
 
     EXPECTED_AUDIENCE = os.getenv("EXPECTED_AUDIENCE", "")  # Expected audience for token validation
 
+    # Validated token cache (skips repeat signature checks for reused bearers)
+    TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", 60))  # Max seconds a validated token is trusted
+    TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 4096))  # Max cached tokens
+
 # Global configuration instance
 config = Config()
\ No newline at end of file
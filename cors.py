@@ -0,0 +1,81 @@
+"""
+CORS Middleware
+
+This module implements a pure ASGI CORS middleware specialized for this
+server's static policy (any origin, credentials allowed, fixed methods).
+Preflight responses are pre-baked so OPTIONS requests are answered with a
+single send() instead of going through Starlette's generic CORSMiddleware.
+"""
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Static preflight headers; origin and requested headers are echoed per request
+# because browsers reject "*" for credentialed requests and never let it cover
+# the Authorization header.
+_PREFLIGHT_HEADERS = [
+    (b"access-control-allow-methods", b"GET, POST, PUT, PATCH, DELETE, OPTIONS"),
+    (b"access-control-max-age", b"86400"),
+    (b"access-control-allow-credentials", b"true"),
+    (b"vary", b"Origin"),
+    (b"content-length", b"0"),
+]
+
+# Headers appended to every non-preflight response carrying an Origin
+# (Vary: Origin is merged separately into any existing Vary header)
+_SIMPLE_HEADERS = [
+    (b"access-control-allow-credentials", b"true"),
+    (b"access-control-expose-headers", b"WWW-Authenticate"),
+]
+
+
+class CORSASGIMiddleware:
+    """
+    CORS middleware with a fixed allow-all policy.
+
+    - Preflight requests (OPTIONS with Origin and Access-Control-Request-Method)
+      are answered directly with a 200 and never reach the wrapped app
+    - Other requests with an Origin header get the CORS response headers appended
+    - Requests without an Origin header pass through untouched
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                request_method = value
+            elif key == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = [(b"access-control-allow-origin", origin), *_PREFLIGHT_HEADERS]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=list(message.get("headers", ())))
+                headers.raw.append((b"access-control-allow-origin", origin))
+                headers.raw.extend(_SIMPLE_HEADERS)
+                # Merge into any existing Vary header so GZip can't drop Origin
+                headers.add_vary_header("Origin")
+                message["headers"] = headers.raw
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
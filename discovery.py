@@ -0,0 +1,92 @@
+"""
+OAuth / OpenID Connect Discovery
+
+This module serves the static discovery documents under /.well-known/
+(OAuth protected resource, OAuth authorization server and OpenID Connect
+configuration). The documents only depend on configuration, so they are
+encoded to bytes once at import and sent directly from ASGI middleware,
+bypassing FastAPI routing and serialization.
+"""
+
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
+from config import config
+from auth import load_protected_resource_metadata
+from logger import logger
+
+_ERR_NOT_CONFIGURED = {"error": "Authorization server not configured"}
+
+if config.SK_ENV_URL:
+    # For ScaleKit, the authorization server is typically the environment URL
+    _OAUTH_AS_METADATA = {
+        "issuer": config.SK_ENV_URL,
+        "authorization_endpoint": f"{config.SK_ENV_URL}/oauth/authorize",
+        "token_endpoint": f"{config.SK_ENV_URL}/oauth/token",
+        "jwks_uri": f"{config.SK_ENV_URL}/.well-known/jwks.json",
+        "response_types_supported": ["code", "token"],
+        "grant_types_supported": ["authorization_code", "client_credentials", "refresh_token"],
+        "token_endpoint_auth_methods_supported": ["client_secret_basic", "client_secret_post"],
+        "scopes_supported": ["openid", "profile", "email"],
+    }
+
+    _OIDC_METADATA = {
+        "issuer": config.SK_ENV_URL,
+        "authorization_endpoint": f"{config.SK_ENV_URL}/oauth/authorize",
+        "token_endpoint": f"{config.SK_ENV_URL}/oauth/token",
+        "userinfo_endpoint": f"{config.SK_ENV_URL}/oauth/userinfo",
+        "jwks_uri": f"{config.SK_ENV_URL}/.well-known/jwks.json",
+        "response_types_supported": ["code", "id_token", "token", "id_token token", "code id_token", "code token", "code id_token token"],
+        "subject_types_supported": ["public"],
+        "id_token_signing_alg_values_supported": ["RS256"],
+        "scopes_supported": ["openid", "profile", "email"],
+        "token_endpoint_auth_methods_supported": ["client_secret_basic", "client_secret_post"],
+        "claims_supported": ["sub", "iss", "aud", "exp", "iat", "auth_time", "nonce", "email", "email_verified", "name", "picture"],
+    }
+else:
+    logger.warning("SK_ENV_URL not configured for OAuth authorization server / OpenID Connect metadata")
+    _OAUTH_AS_METADATA = None
+    _OIDC_METADATA = None
+
+def _prebuild(status: int, body: dict) -> tuple[int, tuple, bytes]:
+    """Pre-encode a JSON document into its status, raw headers and body bytes."""
+    content = orjson.dumps(body)
+    headers = (
+        (b"content-type", b"application/json"),
+        (b"content-length", b"%d" % len(content)),
+    )
+    return status, headers, content
+
+# path -> pre-encoded (status, headers, body)
+_DOCUMENTS = {
+    "/.well-known/oauth-protected-resource": _prebuild(*load_protected_resource_metadata()),
+    "/.well-known/oauth-authorization-server": (
+        _prebuild(200, _OAUTH_AS_METADATA) if _OAUTH_AS_METADATA else _prebuild(500, _ERR_NOT_CONFIGURED)
+    ),
+    "/.well-known/openid-configuration": (
+        _prebuild(200, _OIDC_METADATA) if _OIDC_METADATA else _prebuild(500, _ERR_NOT_CONFIGURED)
+    ),
+}
+
+
+class DiscoveryASGIMiddleware:
+    """
+    Serve the pre-encoded discovery documents for GET/HEAD requests.
+
+    All other paths and methods are passed through to the wrapped app.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            document = _DOCUMENTS.get(scope["path"])
+            if document is not None and scope["method"] in ("GET", "HEAD"):
+                logger.info("Discovery metadata requested: %s", scope["path"])
+                status, headers, body = document
+                # Fresh message/header list per send - outer middleware may mutate them
+                await send({"type": "http.response.start", "status": status, "headers": list(headers)})
+                await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+                return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,26 @@
+"""
+Gunicorn Configuration
+
+Production process manager settings: runs the FastAPI app under multiple
+Uvicorn workers so CPU-bound token validation scales across cores.
+
+Usage:
+    gunicorn app:app -c gunicorn_conf.py
+"""
+
+import os
+from config import config
+
+# Server socket
+bind = f"0.0.0.0:{config.PORT}"
+
+# Worker processes: WORKERS if set, else 2 * usable cores + 1. The uvicorn.run
+# entrypoint keeps config.WORKERS' default of 1. sched_getaffinity respects the
+# CPUs this process may run on, unlike cpu_count().
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = int(os.getenv("WORKERS", len(os.sched_getaffinity(0)) * 2 + 1))
+keepalive = 5
+
+# Logging
+loglevel = config.LOG_LEVEL.lower()
+accesslog = None  # No per-request access log writes
@@ -5,7 +5,10 @@ This module sets up structured logging for the Python MCP Server with
 consistent formatting and configurable log levels.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from config import config
 
@@ -16,8 +19,11 @@ def setup_logger():
     Creates a logger with:
     - Configurable log level from environment variables
     - Consistent timestamp and level formatting
-    - Console output to stdout
+    - Console output to stdout, written off the event loop by a QueueListener
     - Prevention of duplicate handlers
+    
+    The listener is started here and stopped at interpreter exit, so every
+    process that imports this module writes its logs (not just the server).
     """
     logger = logging.getLogger("mcp_server")
     logger.setLevel(getattr(logging, config.LOG_LEVEL.upper()))
@@ -37,10 +43,14 @@ def setup_logger():
     )
     handler.setFormatter(formatter)
     
-    # Add handler to logger
-    logger.addHandler(handler)
+    # Route records through a queue so stdout writes happen on a background thread
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flush queued records on shutdown
     
-    return logger
+    return logger, listener
 
-# Global logger instance
-logger = setup_logger()
\ No newline at end of file
+# Global logger instance and its background writer
+logger, log_listener = setup_logger()
\ No newline at end of file
@@ -6,26 +6,51 @@ It validates Bearer tokens for all MCP requests and ensures proper authorization
 according to the OAuth 2.1 specification.
 """
 
+import hashlib
 import json
-from fastapi import Request
-from fastapi.responses import Response
+import logging
+import time
+from functools import lru_cache
+import jwt
+from cachetools import TTLCache
+from starlette.types import ASGIApp, Receive, Scope, Send
 from config import config
 from logger import logger
 from scalekit import ScalekitClient
 from scalekit.common.scalekit import TokenValidationOptions
 
-# OAuth 2.1 configuration - will be set dynamically per request
-def get_www_authenticate_header(request: Request) -> dict:
-    """Generate WWW-Authenticate header with correct host from request."""
-    # Get the actual host from the request (handles Railway's x-forwarded-host)
-    host = request.headers.get("x-forwarded-host") or request.headers.get("host", f"localhost:{config.PORT}")
-    # Get the protocol (Railway uses https)
-    protocol = request.headers.get("x-forwarded-proto", "http")
-    base_url = f"{protocol}://{host}"
-    
-    return {
-        "WWW-Authenticate": f'Bearer realm="OAuth", resource_metadata="{base_url}/.well-known/oauth-protected-resource"'
-    }
+# Pre-serialized 401 response bodies
+_ERR_MISSING_TOKEN = b'{"error": "Missing Bearer token"}'
+_ERR_SERVICE_UNAVAILABLE = b'{"error": "Authentication service unavailable"}'
+_ERR_INVALID_TOKEN = b'{"error": "Invalid token"}'
+_ERR_VALIDATION_FAILED = b'{"error": "Token validation failed"}'
+
+# Fallback host for the WWW-Authenticate resource_metadata URL
+_DEFAULT_HOST = f"localhost:{config.PORT}".encode()
+
+@lru_cache(maxsize=64)
+def get_www_authenticate_header(protocol: bytes, host: bytes) -> bytes:
+    """Build (and memoize) the WWW-Authenticate header value for a protocol/host pair."""
+    return b'Bearer realm="OAuth", resource_metadata="%s://%s/.well-known/oauth-protected-resource"' % (protocol, host)
+
+async def _send_unauthorized(
+    send: Send, body: bytes, protocol: bytes | None, forwarded_host: bytes | None, host: bytes | None
+) -> None:
+    """Send a 401 JSON response carrying the OAuth WWW-Authenticate challenge."""
+    # Resolve the public URL (handles Railway's x-forwarded-host/proto)
+    www_authenticate = get_www_authenticate_header(
+        protocol or b"http", forwarded_host or host or _DEFAULT_HOST
+    )
+    await send({
+        "type": "http.response.start",
+        "status": 401,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", b"%d" % len(body)),
+            (b"www-authenticate", www_authenticate),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
 
 # Initialize ScaleKit client for token validation
 try:
@@ -37,103 +62,134 @@ try:
     SCALEKIT_AVAILABLE = True
     logger.info("ScaleKit client initialized successfully")
 except Exception as e:
-    logger.warning(f"ScaleKit SDK not available: {e}")
+    logger.warning("ScaleKit SDK not available: %s", e)
     scalekit_client = None
     SCALEKIT_AVAILABLE = False
 
-async def auth_middleware(request: Request, call_next):
+# Token validation options are static for the lifetime of the process
+_VALIDATION_OPTIONS = TokenValidationOptions(
+    issuer=config.SK_ENV_URL,
+    audience=[config.EXPECTED_AUDIENCE] if config.EXPECTED_AUDIENCE else None
+)
+
+# Cache of recently validated tokens: blake2b(token) -> wall-clock expiry.
+# Only successful validations are stored, and never past the token's own exp.
+_token_cache = TTLCache(maxsize=config.TOKEN_CACHE_SIZE, ttl=config.TOKEN_CACHE_TTL)
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash the token so raw bearer credentials are never kept in memory."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def _is_token_cached(key: bytes) -> bool:
+    """Return True if the token was validated recently and has not expired."""
+    expires_at = _token_cache.get(key)
+    return expires_at is not None and expires_at > time.time()
+
+def _cache_valid_token(key: bytes, token: str) -> None:
+    """Remember a validated token until min(now + TTL, token exp)."""
+    expires_at = time.time() + config.TOKEN_CACHE_TTL
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+        exp = claims.get("exp")
+        # Ignore malformed exp values rather than failing an already-valid request
+        if isinstance(exp, (int, float)) and not isinstance(exp, bool):
+            expires_at = min(expires_at, float(exp))
+    except jwt.PyJWTError:
+        # Signature was already verified by ScaleKit; fall back to the TTL alone
+        pass
+    _token_cache[key] = expires_at
+
+class AuthASGIMiddleware:
     """
     Authentication middleware for MCP requests following ScaleKit OAuth 2.1 specification.
     
+    Implemented as pure ASGI middleware (rather than BaseHTTPMiddleware) so
+    authenticated requests are passed straight to the wrapped app without an
+    extra Request/Response round-trip.
+    
     This middleware:
     1. Allows public access to well-known endpoints and health checks
     2. Extracts Bearer tokens from Authorization headers
     3. Validates tokens using ScaleKit SDK
     4. Returns proper OAuth 2.1 error responses on failure
     """
-    try:
-        # Log all request headers in a pretty format
-        headers_dict = dict(request.headers)
-        logger.info(f"Request headers for {request.method} {request.url.path}:")
-        for header, value in headers_dict.items():
-            logger.info(f"  {header}: {value}")
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+
+        # Dump request headers only when debugging (costly on every request)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request headers for %s %s: %s", method, path,
+                         {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]})
 
         # Allow public access to OAuth discovery, health, and MCP root endpoints
-        if ".well-known" in request.url.path or request.url.path == "/health":
-            return await call_next(request)
+        if path == "/health" or path.startswith("/.well-known/"):
+            await self.app(scope, receive, send)
+            return
+        
+        # Single pass over the raw byte headers for the few we need
+        auth_header = host = forwarded_host = protocol = None
+        for key, value in scope["headers"]:
+            if key == b"authorization":
+                auth_header = value
+            elif key == b"host":
+                host = value
+            elif key == b"x-forwarded-host":
+                forwarded_host = value
+            elif key == b"x-forwarded-proto":
+                protocol = value
         
         # Extract Bearer token
-        auth_header = request.headers.get("authorization")
-        logger.info(f"Auth request for {request.method} {request.url.path}")
+        logger.info("Auth request for %s %s", method, path)
         
-        if not auth_header or not auth_header.startswith("Bearer "):
-            logger.warning(f"Missing Bearer token for {request.method} {request.url.path}")
-            return Response(
-                content='{"error": "Missing Bearer token"}',
-                media_type="application/json",
-                status_code=401,
-                headers=get_www_authenticate_header(request)
-            )
+        if not auth_header or not auth_header.startswith(b"Bearer "):
+            logger.warning("Missing Bearer token for %s %s", method, path)
+            await _send_unauthorized(send, _ERR_MISSING_TOKEN, protocol, forwarded_host, host)
+            return
         
-        token = auth_header.split("Bearer ")[1].strip()
-        logger.info(f"Token extracted, length: {len(token)}")
+        token = auth_header[7:].strip().decode("latin-1")  # len(b"Bearer ") == 7
+        logger.debug("Token extracted, length: %d", len(token))
         
         if not SCALEKIT_AVAILABLE:
             logger.error("ScaleKit SDK not available for token validation")
-            return Response(
-                content='{"error": "Authentication service unavailable"}',
-                media_type="application/json",
-                status_code=401,
-                headers=get_www_authenticate_header(request)
-            )
+            await _send_unauthorized(send, _ERR_SERVICE_UNAVAILABLE, protocol, forwarded_host, host)
+            return
         
+        # Skip signature verification for recently validated tokens
+        cache_key = _token_cache_key(token)
+        if _is_token_cached(cache_key):
+            logger.debug("Token validation cache hit")
+            await self.app(scope, receive, send)
+            return
+
+        # Token validation with ScaleKit
+        logger.info("Validating token with ScaleKit...")
+        logger.debug("SK_ENV_URL: %s", config.SK_ENV_URL)
+        logger.debug("EXPECTED_AUDIENCE: %s", config.EXPECTED_AUDIENCE)
+
         try:
-            # Token validation with ScaleKit
-            logger.info("Validating token with ScaleKit...")
-            logger.info(f"SK_ENV_URL: {config.SK_ENV_URL}")
-            logger.info(f"EXPECTED_AUDIENCE: {config.EXPECTED_AUDIENCE}")
-
-            # Build validation options
-            options = TokenValidationOptions(
-                issuer=config.SK_ENV_URL,
-                audience=[config.EXPECTED_AUDIENCE] if config.EXPECTED_AUDIENCE else None
-            )
-
-            is_valid = scalekit_client.validate_access_token(token, options=options)
-            logger.info(f"Token validation result: {is_valid}")
-            
-            if not is_valid:
-                logger.warning(f"Token validation failed for {request.method} {request.url.path}")
-                logger.warning(f"Check that SK_ENV_URL matches token issuer and EXPECTED_AUDIENCE matches token audience")
-                return Response(
-                    content='{"error": "Invalid token"}',
-                    media_type="application/json",
-                    status_code=401,
-                    headers=get_www_authenticate_header(request)
-                )
-            
-            logger.info(f"Authentication successful for {request.method} {request.url.path}")
-            return await call_next(request)
-            
-        except Exception as e:
-            logger.error(f"Token validation exception: {str(e)}")
-            logger.error(f"Exception type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return Response(
-                content='{"error": "Token validation failed"}',
-                media_type="application/json",
-                status_code=401,
-                headers=get_www_authenticate_header(request)
-            )
+            is_valid = scalekit_client.validate_access_token(token, options=_VALIDATION_OPTIONS)
+        except Exception:
+            # Only the SDK call is guarded; downstream errors reach Starlette's handlers
+            logger.exception("Token validation exception")
+            await _send_unauthorized(send, _ERR_VALIDATION_FAILED, protocol, forwarded_host, host)
+            return
+        logger.info("Token validation result: %s", is_valid)
+        
+        if not is_valid:
+            logger.warning("Token validation failed for %s %s", method, path)
+            logger.warning("Check that SK_ENV_URL matches token issuer and EXPECTED_AUDIENCE matches token audience")
+            await _send_unauthorized(send, _ERR_INVALID_TOKEN, protocol, forwarded_host, host)
+            return
         
-    except Exception as e:
-        logger.error(f"Authentication error: {str(e)}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        return Response(
-            content='{"error": "Authentication failed"}',
-            media_type="application/json",
-            status_code=401,
-            headers=get_www_authenticate_header(request)
-        )
\ No newline at end of file
+        _cache_valid_token(cache_key, token)
+        logger.info("Authentication successful for %s %s", method, path)
+        await self.app(scope, receive, send)